@@ -1,10 +1,15 @@
 import requests
-import json
+import orjson
 import os
+import atexit
+import re
+import gzip
+import tempfile
 import time
-import glob
-import base64
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from tqdm import tqdm
 from typing import List, Dict, Optional, Tuple
 
@@ -17,57 +22,201 @@ GitHub热门项目分析机器人
 4. 对比历史趋势变化
 """
 
-def get_date_n_days_ago(days: int) -> str:
+def get_date_n_days_ago(days: int, now: Optional[datetime] = None) -> str:
     """
     获取n天前的ISO格式日期字符串
     
     Args:
         days: 天数
+        now: 基准时间（默认当前时间）
         
     Returns:
         ISO格式日期字符串 (e.g., "2025-07-24T15:48:57Z")
     """
-    dt = datetime.now() - timedelta(days=days)
+    dt = (now or datetime.now()) - timedelta(days=days)
     return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-def build_trending_url(days: int = 7, limit: int = 10) -> str:
+def build_trending_url(days: int = 7, limit: int = 10, now: Optional[datetime] = None) -> str:
     """
     构建GitHub热门项目查询URL
     
     Args:
         days: 查询天数范围
         limit: 返回项目数量
+        now: 基准时间（默认当前时间）
         
     Returns:
         GitHub API查询URL
     """
     base_url = "https://api.github.com/search/repositories"
-    since_date = get_date_n_days_ago(days)
+    since_date = get_date_n_days_ago(days, now)
     created_query = f"created:>{since_date}"
     return f"{base_url}?q={created_query}&sort=stars&order=desc&per_page={limit}"
 
-def get_trending_repos(days: int = 7, limit: int = 10, token: Optional[str] = None) -> List[Dict]:
+# GitHub GraphQL接口：一次请求同时取回搜索结果和各项目README
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GITHUB_MAX_PAGE_SIZE = 100  # search单页上限
+
+# 所有GitHub API请求共用同一会话，复用TCP/TLS连接
+GITHUB_SESSION = requests.Session()
+GITHUB_SESSION.headers.update({"Accept": "application/vnd.github.v3+json"})
+atexit.register(GITHUB_SESSION.close)
+
+TRENDING_REPOS_QUERY = """
+query($q: String!, $limit: Int!) {
+  search(query: $q, type: REPOSITORY, first: $limit) {
+    nodes {
+      ... on Repository {
+        name
+        nameWithOwner
+        url
+        description
+        stargazerCount
+        forkCount
+        primaryLanguage { name }
+        createdAt
+        updatedAt
+        owner { login url }
+        readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+        readmeLower: object(expression: "HEAD:readme.md") { ... on Blob { text } }
+      }
+    }
+  }
+}
+"""
+
+def convert_graphql_repo(node: Dict) -> Dict:
+    """
+    将GraphQL返回的仓库节点转换为REST API的字段格式，保证下游代码和历史数据兼容
+    
+    Args:
+        node: GraphQL search结果中的Repository节点
+        
+    Returns:
+        与REST API字段名一致的仓库字典
+    """
+    owner = node.get('owner') or {}
+    primary_language = node.get('primaryLanguage') or {}
+    return {
+        "name": node['name'],
+        "full_name": node['nameWithOwner'],
+        "html_url": node['url'],
+        "description": node.get('description'),
+        "stargazers_count": node.get('stargazerCount', 0),
+        "forks_count": node.get('forkCount', 0),
+        "language": primary_language.get('name'),
+        "created_at": node.get('createdAt'),
+        "updated_at": node.get('updatedAt'),
+        "owner": {
+            "login": owner.get('login'),
+            "html_url": owner.get('url')
+        }
+    }
+
+def convert_rest_repo(item: Dict) -> Dict:
+    """
+    将REST搜索结果裁剪为报告所需字段，与convert_graphql_repo的结构一致
+    
+    Args:
+        item: REST search结果中的仓库条目
+        
+    Returns:
+        仅包含所需字段的仓库字典
+    """
+    owner = item.get('owner') or {}
+    return {
+        "name": item['name'],
+        "full_name": item['full_name'],
+        "html_url": item['html_url'],
+        "description": item.get('description'),
+        "stargazers_count": item.get('stargazers_count', 0),
+        "forks_count": item.get('forks_count', 0),
+        "language": item.get('language'),
+        "created_at": item.get('created_at'),
+        "updated_at": item.get('updated_at'),
+        "owner": {
+            "login": owner.get('login'),
+            "html_url": owner.get('html_url')
+        }
+    }
+
+def get_trending_repos(days: int = 7, limit: int = 10, token: Optional[str] = None,
+                       now: Optional[datetime] = None) -> List[Dict]:
     """
     从GitHub API获取热门项目列表
     
+    有令牌时使用GraphQL一次性获取项目信息和README（README存入预取表，
+    避免后续逐个请求）；无令牌时GraphQL不可用，退回REST搜索接口。
+    
     Args:
         days: 查询天数范围
         limit: 返回项目数量
         token: GitHub API令牌
+        now: 基准时间（默认当前时间）
         
     Returns:
         热门项目列表，每个项目为字典格式
     """
-    url = build_trending_url(days, limit)
-    headers = {"Accept": "application/vnd.github.v3+json"}
-    if token:
-        headers["Authorization"] = f"token {token}"
+    limit = min(limit, GITHUB_MAX_PAGE_SIZE)
+    if not token:
+        return get_trending_repos_rest(days, limit, now)
+    
+    since_date = get_date_n_days_ago(days, now)
+    payload = {
+        "query": TRENDING_REPOS_QUERY,
+        "variables": {"q": f"created:>{since_date} sort:stars-desc", "limit": limit}
+    }
+    headers = {"Authorization": f"bearer {token}"}
+    
+    try:
+        response = GITHUB_SESSION.post(GITHUB_GRAPHQL_URL, json=payload, headers=headers, timeout=30)
+        response.raise_for_status()  # 检查HTTP错误
+        result = orjson.loads(response.content)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        print(f"❌ 获取trending仓库失败: {e}")
+        return []
+    
+    # GraphQL可能返回部分错误（如个别节点解析失败），仅在没有搜索结果时才视为失败
+    for error in result.get('errors') or []:
+        print(f"⚠️ GraphQL查询错误: {error.get('message')}")
+    
+    search = (result.get('data') or {}).get('search')
+    if not search:
+        print("❌ 获取trending仓库失败: GraphQL未返回搜索结果")
+        return []
+    
+    repos = []
+    for node in search.get('nodes', []):
+        if not node:
+            continue
+        repo = convert_graphql_repo(node)
+        # 预存README内容；均为空时由get_readme_content走REST接口兜底
+        readme_blob = node.get('readme') or node.get('readmeLower')
+        if readme_blob and readme_blob.get('text'):
+            README_PREFETCH[repo['full_name']] = readme_blob['text']
+        repos.append(repo)
+    return repos
+
+def get_trending_repos_rest(days: int = 7, limit: int = 10, now: Optional[datetime] = None) -> List[Dict]:
+    """
+    通过REST搜索接口获取热门项目列表（无令牌时使用）
+    
+    Args:
+        days: 查询天数范围
+        limit: 返回项目数量
+        now: 基准时间（默认当前时间）
+        
+    Returns:
+        热门项目列表，每个项目为字典格式
+    """
+    url = build_trending_url(days, limit, now)
         
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = GITHUB_SESSION.get(url, timeout=10)
         response.raise_for_status()  # 检查HTTP错误
-        return response.json().get('items', [])
-    except requests.exceptions.RequestException as e:
+        items = orjson.loads(response.content).get('items', [])
+        return [convert_rest_repo(item) for item in items]
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"❌ 获取trending仓库失败: {e}")
         return []
 
@@ -86,19 +235,20 @@ def analyze_data(repos: List[Dict]) -> Optional[Dict]:
             "repo_count": 项目数量,
             "total_stars": 总星标数,
             "total_forks": 总Fork数,
-            "language_stats": 语言分布统计
+            "language_stats": 语言分布统计（按项目数量降序排列）
         }
     """
     if not repos:
         return None
 
-    # 统计语言分布（处理None值）
-    language_list = [repo['language'] or 'N/A' for repo in repos]
-    language_stats = Counter(language_list)
-    
-    # 计算星标和Fork总数
-    total_stars = sum(repo['stargazers_count'] for repo in repos)
-    total_forks = sum(repo.get('forks_count', 0) for repo in repos)
+    # 单次遍历同时统计语言分布（处理None值）和星标、Fork总数
+    language_stats = Counter()
+    total_stars = 0
+    total_forks = 0
+    for repo in repos:
+        language_stats[repo['language'] or 'N/A'] += 1
+        total_stars += repo['stargazers_count']
+        total_forks += repo.get('forks_count', 0)
     
     return {
         "repo_count": len(repos),
@@ -107,6 +257,24 @@ def analyze_data(repos: List[Dict]) -> Optional[Dict]:
         "language_stats": dict(language_stats.most_common())
     }
 
+def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
+    """
+    截断超长文本
+    
+    Args:
+        text: 原始文本
+        max_length: 最大长度
+        suffix: 截断后追加的后缀
+        
+    Returns:
+        不超过max_length时原样返回，否则截断并追加后缀
+    """
+    return text if len(text) <= max_length else text[:max_length] + suffix
+
+# 控制台报告中的日期字段及显示格式
+DATE_LABELS = {'created_at': "创建时间", 'updated_at': "更新时间"}
+DATE_LINE_FORMAT = "📅 {label}: {dt:%Y年%m月%d日}"
+
 def print_console_report(repos: List[Dict], analysis_result: Dict):
     """
     在控制台打印分析报告
@@ -131,9 +299,7 @@ def print_console_report(repos: List[Dict], analysis_result: Dict):
         print(f"🔗 链接: {repo['html_url']}")
         
         # 处理描述文本
-        description = repo.get('description') or '无描述'
-        if len(description) > 100:
-            description = description[:100] + "..."
+        description = truncate_text(repo.get('description') or '无描述', 100)
         print(f"📝 描述: {description}")
         
         print(f"⭐ 星标数: {repo['stargazers_count']}")
@@ -143,23 +309,20 @@ def print_console_report(repos: List[Dict], analysis_result: Dict):
         print(f"💻 编程语言: {language}")
         
         # 格式化日期
-        for date_type in ['created_at', 'updated_at']:
+        for date_type, label in DATE_LABELS.items():
             date_str = repo.get(date_type)
             if date_str:
                 try:
                     dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    label = "创建时间" if date_type == 'created_at' else "更新时间"
-                    print(f"📅 {label}: {dt.strftime('%Y年%m月%d日')}")
+                    print(DATE_LINE_FORMAT.format(label=label, dt=dt))
                 except ValueError:
                     print(f"📅 {label}: {date_str}")
         
         print("-" * 50)
     
-    # 打印语言分布（按项目数量降序排序）
+    # 打印语言分布（analyze_data已按项目数量降序排列）
     print("\n编程语言分布:")
-    sorted_stats = sorted(analysis_result['language_stats'].items(), 
-                         key=lambda x: x[1], reverse=True)
-    for lang, count in sorted_stats:
+    for lang, count in analysis_result['language_stats'].items():
         lang_display = lang if lang else "N/A"
         print(f"  {lang_display}: {count} 个项目")
     
@@ -168,7 +331,11 @@ def print_console_report(repos: List[Dict], analysis_result: Dict):
     print(f"🍴 总Fork数: {analysis_result['total_forks']}")
     print(separator)
 
-def save_markdown_report(repos: List[Dict], analysis_result: Dict, days: int = 7, filename: Optional[str] = None) -> str:
+# Markdown表格单元格转义：换行替换为空格，竖线替换为全角避免破坏表格
+MD_CELL_TRANSLATION = str.maketrans({'\r': ' ', '\n': ' ', '|': '｜'})
+
+def save_markdown_report(repos: List[Dict], analysis_result: Dict, days: int = 7, filename: Optional[str] = None,
+                         now: Optional[datetime] = None) -> str:
     """
     将分析结果保存为Markdown格式的报告
     
@@ -177,14 +344,15 @@ def save_markdown_report(repos: List[Dict], analysis_result: Dict, days: int = 7
         analysis_result: 分析结果字典
         days: 查询天数
         filename: 输出文件名（可选）
+        now: 查询时间（默认当前时间）
         
     Returns:
         生成的报告文件路径
     """
-    today_str = datetime.now().strftime('%Y-%m-%d')
+    now = now or datetime.now()
     if not filename:
-        filename = f"github_trending_{days}days_{today_str}.md"
-    query_time = datetime.now().strftime('%Y年%m月%d日')
+        filename = f"github_trending_{days}days_{now.strftime('%Y-%m-%d')}.md"
+    query_time = now.strftime('%Y年%m月%d日')
     
     # 检查环境变量
     github_token = os.getenv("GITHUB_TOKEN")
@@ -196,11 +364,20 @@ def save_markdown_report(repos: List[Dict], analysis_result: Dict, days: int = 7
     # 添加AI分析摘要
     repos = enrich_repos_with_ai_summaries(repos, github_token, ai_api_key)
     
-    # 构建项目表格
-    table_header = "| 排名 | 📦 项目名称 | 👤 作者 | ⭐ Star | 🍴 Fork | 语言 | 📝 描述 |\n"
-    table_separator = "|------|----------|------|--------|--------|------|------|\n"
+    # 报告内容先汇总到列表，最后一次性写入文件
+    parts = [
+        # 报告标题
+        "# 🔥 GitHub 热门项目洞察报告\n\n",
+        f"**查询时间：** {query_time}  ",
+        f"**时间范围：** 最近{days}天  ",
+        f"**项目数量：** {len(repos)}个\n\n",
+        
+        # 项目排行榜
+        "## 🏆 热门项目排行榜\n\n",
+        "| 排名 | 📦 项目名称 | 👤 作者 | ⭐ Star | 🍴 Fork | 语言 | 📝 描述 |\n",
+        "|------|----------|------|--------|--------|------|------|\n",
+    ]
     
-    table_rows = []
     for i, repo in enumerate(repos, 1):
         # 项目基本信息
         name_link = f"[{repo['name']}]({repo['html_url']})"
@@ -213,10 +390,7 @@ def save_markdown_report(repos: List[Dict], analysis_result: Dict, days: int = 7
         language = repo['language'] or 'N/A'
         
         # 处理描述文本
-        description = repo.get('description') or '无描述'
-        description = description.replace('\n', ' ').replace('|', '｜')
-        if len(description) > 50:
-            description = description[:50] + "..."
+        description = truncate_text((repo.get('description') or '无描述').translate(MD_CELL_TRANSLATION), 50)
         
         # 添加AI分析摘要
         formatted_ai_summary = repo['ai_summary'].replace('\n', '\n> ')
@@ -226,43 +400,25 @@ def save_markdown_report(repos: List[Dict], analysis_result: Dict, days: int = 7
         description_with_ai = f"{description}{ai_summary_md}"
         
         # 添加表格行
-        table_rows.append(f"| {i} | {name_link} | {author_md} | {stars} | {forks} | {language} | {description_with_ai} |")
-    
-    # 构建语言分布表格（按项目数量降序排序）
-    sorted_stats = sorted(analysis_result['language_stats'].items(), 
-                         key=lambda x: x[1], reverse=True)
-    lang_table = [
-        "| 语言 | 项目数量 |",
-        "| :--- | :------- |",  # 左对齐
-        *[f"| {lang if lang else 'N/A'} | {count}个项目 |" 
-          for lang, count in sorted_stats]
-    ]
+        parts.append(f"| {i} | {name_link} | {author_md} | {stars} | {forks} | {language} | {description_with_ai} |\n")
+    parts.append("\n")
+    
+    # 语言分布（analyze_data已按项目数量降序排列）
+    parts.append("## 📊 编程语言分布\n\n")
+    parts.append("| 语言 | 项目数量 |\n")
+    parts.append("| :--- | :------- |\n")  # 左对齐
+    parts.extend(f"| {lang if lang else 'N/A'} | {count}个项目 |\n" for lang, count in analysis_result['language_stats'].items())
+    parts.append("\n")
+    
+    # 总结
+    parts.append(f"⭐ 总星标数: {analysis_result['total_stars']}  ")
+    parts.append(f"🍴 总Fork数: {analysis_result['total_forks']}\n")
+    parts.append("\n> 注：N/A 表示该项目未指定主语言，或为文档/多语言项目。\n")
     
     # 写入Markdown文件
     try:
         with open(filename, 'w', encoding='utf-8') as f:
-            # 报告标题
-            f.write("# 🔥 GitHub 热门项目洞察报告\n\n")
-            f.write(f"**查询时间：** {query_time}  ")
-            f.write(f"**时间范围：** 最近{days}天  ")
-            f.write(f"**项目数量：** {len(repos)}个\n\n")
-            
-            # 项目排行榜
-            f.write("## 🏆 热门项目排行榜\n\n")
-            f.write(table_header)
-            f.write(table_separator)
-            f.write("\n".join(table_rows))
-            f.write("\n\n")
-            
-            # 语言分布
-            f.write("## 📊 编程语言分布\n\n")
-            f.write("\n".join(lang_table))
-            f.write("\n\n")
-            
-            # 总结
-            f.write(f"⭐ 总星标数: {analysis_result['total_stars']}  ")
-            f.write(f"🍴 总Fork数: {analysis_result['total_forks']}\n")
-            f.write("\n> 注：N/A 表示该项目未指定主语言，或为文档/多语言项目。\n")
+            f.write("".join(parts))
         
         print(f"✅ Markdown报告已保存: {filename}")
         return filename
@@ -275,6 +431,95 @@ README_CACHE_DIR = "readme_cache"
 if not os.path.exists(README_CACHE_DIR):
     os.makedirs(README_CACHE_DIR)
 
+README_CACHE_COMPRESS_LEVEL = 6  # 缓存gzip压缩级别，兼顾压缩率和速度
+README_MAX_CHARS = 12000  # 单个README送入AI分析的最大字数
+README_TRUNCATED_SUFFIX = "...[内容截断]"
+# REST接口获取README时最多读取的字节数（UTF-8单字符最多4字节）
+README_FETCH_MAX_BYTES = README_MAX_CHARS * 4
+
+# GraphQL查询时顺带取回的README内容（仓库全名 -> 内容）
+README_PREFETCH: Dict[str, str] = {}
+
+# 并发请求数：README获取走GitHub API，AI总结需控制并发以免触发速率限制
+README_FETCH_WORKERS = 10
+AI_SUMMARY_WORKERS = 5
+
+class RateLimiter:
+    """
+    线程安全的令牌桶限流器
+    
+    配额充足时立即放行，仅在令牌耗尽或服务端要求等待（429）时阻塞。
+    """
+    
+    def __init__(self, rate: int, period: float):
+        """
+        Args:
+            rate: 每个周期内允许的请求数（同时也是桶容量）
+            period: 周期长度（秒）
+        """
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self.updated_at = time.monotonic()
+        self.resume_at = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """获取一个令牌，必要时阻塞等待"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+                self.updated_at = now
+                if now >= self.resume_at and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.resume_at - now, (1 - self.tokens) / self.fill_rate)
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """
+        按服务端要求暂停发放令牌
+        
+        Args:
+            seconds: 暂停秒数
+        """
+        with self.lock:
+            self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+
+# DeepSeek请求配置：复用同一会话保持TLS连接，多个项目合并为一次请求
+DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
+DEEPSEEK_SESSION = requests.Session()
+atexit.register(DEEPSEEK_SESSION.close)
+AI_BATCH_SIZE = 5
+AI_BATCH_MAX_CHARS = 40000  # 批量请求中README总字数上限，超出则逐个请求
+BATCH_SEPARATOR_PATTERN = re.compile(r'^\s*-{3,}\s*$', re.MULTILINE)
+DEEPSEEK_RATE_LIMITER = RateLimiter(50, 60)  # 每分钟最多50次请求
+AI_MAX_RETRIES = 2  # 遇到429时的最大重试次数
+DEFAULT_RETRY_AFTER = 5  # 429响应未给出Retry-After时的等待秒数
+
+# AI分析提示模板：固定的分析要求放在最前面，相同前缀可被DeepSeek上下文缓存复用
+PROMPT_HEAD = """作为GitHub趋势分析专家，请从以下3个方面分析项目：
+1. 🎯 核心功能与解决的问题
+2. 💡 技术亮点与创新点
+3. 🔥 近期关注度高的原因
+
+要求：
+- 每点用"- "开头
+- 每点不超过40字
+- 使用专业但简洁的技术语言
+"""
+PROMPT_BATCH_NOTE = '- 按项目顺序逐个分析，不要输出项目标题，项目之间用单独一行的"---"分隔\n'
+PROMPT_REPO_TEMPLATE = """项目信息：
+- 名称：{name}
+- 主要语言：{language}
+- 星标数：{stars}
+- 描述：{description}
+
+README内容：
+{content}
+"""
+
 def enrich_repos_with_ai_summaries(repos: List[Dict], github_token: Optional[str], ai_api_key: Optional[str]) -> List[Dict]:
     """
     为每个仓库添加AI生成的摘要
@@ -296,23 +541,67 @@ def enrich_repos_with_ai_summaries(repos: List[Dict], github_token: Optional[str
     
     print(f"⏳ 开始为 {len(repos)} 个项目生成AI分析摘要...")
     
-    # 使用进度条处理每个仓库
-    for repo in tqdm(repos, desc="生成AI总结"):
-        # 获取README内容
-        readme_content = get_readme_content(repo['full_name'], github_token)
-        
-        if readme_content:
-            # 生成AI摘要
-            repo['ai_summary'] = summarize_with_ai(readme_content, ai_api_key, repo)
-        else:
+    # 并发获取所有README（纯网络等待，线程即可充分并行）
+    with ThreadPoolExecutor(max_workers=README_FETCH_WORKERS) as executor:
+        readmes = list(tqdm(
+            executor.map(lambda repo: get_readme_content(repo['full_name'], github_token), repos),
+            total=len(repos), desc="获取README"
+        ))
+    
+    # 有README的项目按批合并请求，批次之间并发，限制同时进行的请求数防止触发速率限制
+    for repo, readme_content in zip(repos, readmes):
+        if not readme_content:
             repo['ai_summary'] = "未能获取README内容。"
+    pending = [(repo, readme_content) for repo, readme_content in zip(repos, readmes) if readme_content]
+    batches = pack_ai_batches(pending)
+    
+    with ThreadPoolExecutor(max_workers=AI_SUMMARY_WORKERS) as executor:
+        batch_results = list(tqdm(
+            executor.map(lambda batch: summarize_batch_with_ai(batch, ai_api_key), batches),
+            total=len(batches), desc="生成AI总结"
+        ))
+    
+    for batch, summaries in zip(batches, batch_results):
+        for (repo, _), summary in zip(batch, summaries):
+            repo['ai_summary'] = summary
     
     return repos
 
+def pack_ai_batches(pending: List[Tuple[Dict, str]]) -> List[List[Tuple[Dict, str]]]:
+    """
+    按README截断后的总字数贪心分批：README较大时批次变小，而不是整批退回逐个请求
+    
+    Args:
+        pending: (仓库信息字典, README内容) 列表
+        
+    Returns:
+        批次列表，每批不超过AI_BATCH_SIZE个项目且总字数不超过AI_BATCH_MAX_CHARS
+    """
+    batches = []
+    batch = []
+    batch_chars = 0
+    for repo, content in pending:
+        # 与truncate_readme截断后的长度一致
+        size = len(content) if len(content) <= README_MAX_CHARS else README_MAX_CHARS + len(README_TRUNCATED_SUFFIX)
+        if batch and (len(batch) >= AI_BATCH_SIZE or batch_chars + size > AI_BATCH_MAX_CHARS):
+            batches.append(batch)
+            batch = []
+            batch_chars = 0
+        batch.append((repo, content))
+        batch_chars += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+@lru_cache(maxsize=256)
 def get_readme_content(repo_full_name: str, token: Optional[str]) -> Optional[str]:
     """
     获取仓库的README内容（带缓存机制）
     
+    磁盘缓存旁存放GitHub返回的ETag，每次通过If-None-Match条件请求校验，
+    未变更时服务端返回304（不计入速率限制），直接使用缓存内容；
+    同一进程内的重复调用由lru_cache直接返回。
+    
     Args:
         repo_full_name: 仓库全名（owner/repo）
         token: GitHub API令牌
@@ -320,124 +609,257 @@ def get_readme_content(repo_full_name: str, token: Optional[str]) -> Optional[st
     Returns:
         README内容字符串，获取失败返回None
     """
-    # 创建安全的缓存文件名
+    # 优先使用GraphQL查询时已取回的内容
+    if repo_full_name in README_PREFETCH:
+        return README_PREFETCH[repo_full_name]
+    
+    # 创建安全的缓存文件名（内容gzip压缩存储）
     cache_filename = f"{repo_full_name.replace('/', '__')}.md"
-    cache_path = os.path.join(README_CACHE_DIR, cache_filename)
-    
-    # 检查缓存是否存在且有效（7天内）
-    if os.path.exists(cache_path):
-        cache_age = time.time() - os.path.getmtime(cache_path)
-        if cache_age < 60 * 60 * 24 * 7:  # 7天有效期
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-            except Exception as e:
-                print(f"⚠️ 读取缓存失败: {e}")
-        else:
-            print(f"♻️ 缓存已过期: {cache_filename}")
+    legacy_cache_path = os.path.join(README_CACHE_DIR, cache_filename)
+    cache_path = f"{legacy_cache_path}.gz"
+    etag_path = f"{legacy_cache_path}.etag"
+    
+    # 旧版未压缩缓存在首次读取时转换
+    if not os.path.exists(cache_path) and os.path.exists(legacy_cache_path):
+        migrate_readme_cache(legacy_cache_path, cache_path)
+    has_cache = os.path.exists(cache_path)
     
-    # 没有有效缓存，从GitHub API获取
     if not token:
+        if has_cache:
+            return read_readme_cache(cache_path)
         print(f"⚠️ 缺少GitHub token，无法获取 {repo_full_name} 的README")
         return None
     
     url = f"https://api.github.com/repos/{repo_full_name}/readme"
+    # 直接请求原始文本，省去base64编码和JSON包装
     headers = {
         "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
+        "Accept": "application/vnd.github.raw+json"
     }
+    # 有缓存时发送条件请求
+    if has_cache and os.path.exists(etag_path):
+        try:
+            with open(etag_path, 'r', encoding='utf-8') as f:
+                headers["If-None-Match"] = f.read().strip()
+        except Exception as e:
+            print(f"⚠️ 读取ETag失败: {e}")
     
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+        response = GITHUB_SESSION.get(url, headers=headers, timeout=15, stream=True)
+        if response.status_code == 304:
+            response.close()
+            # 内容未变更，刷新缓存时间后直接使用
+            cached_content = read_readme_cache(cache_path)
+            if cached_content is not None:
+                os.utime(cache_path)
+                return cached_content
+            # 缓存不可读：删除ETag后重新完整获取，否则之后每次都会得到304
+            print(f"♻️ 缓存损坏，重新获取: {cache_filename}")
+            remove_file(etag_path)
+            del headers["If-None-Match"]
+            response = GITHUB_SESSION.get(url, headers=headers, timeout=15, stream=True)
         
-        content_base64 = response.json().get('content', '')
-        decoded_content = base64.b64decode(content_base64).decode('utf-8')
+        with response:
+            response.raise_for_status()
+            etag = response.headers.get('ETag')
+            
+            # 只读取AI分析所需的前缀，超大README无需完整下载和解码
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(chunk_size=8192):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= README_FETCH_MAX_BYTES:
+                    break
+        # 截断处可能切开多字节字符，解码时忽略
+        decoded_content = b"".join(chunks)[:README_FETCH_MAX_BYTES].decode('utf-8', errors='ignore')
         
-        # 保存到缓存
+        # 保存到缓存：先删除旧ETag，确保缓存与ETag不会错配
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                f.write(decoded_content)
+            remove_file(etag_path)
+            write_readme_cache(cache_path, decoded_content)
+            if etag:
+                write_file_atomic(etag_path, etag.encode('utf-8'))
         except Exception as e:
             print(f"⚠️ 保存缓存失败: {e}")
             
         return decoded_content
     except requests.exceptions.RequestException as e:
         print(f"❌ 获取README失败: {e}")
+        # 请求失败时退回使用旧缓存
+        return read_readme_cache(cache_path) if has_cache else None
+
+def read_readme_cache(cache_path: str) -> Optional[str]:
+    """
+    读取README缓存文件
+    
+    Args:
+        cache_path: 缓存文件路径
+        
+    Returns:
+        缓存内容，读取失败返回None
+    """
+    try:
+        with gzip.open(cache_path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        print(f"⚠️ 读取缓存失败: {e}")
         return None
 
-def summarize_with_ai(content: str, api_key: str, repo: Dict) -> str:
+def write_readme_cache(cache_path: str, content: str):
     """
-    使用DeepSeek API生成项目摘要
+    压缩写入README缓存文件
+    
+    Args:
+        cache_path: 缓存文件路径
+        content: README内容
+    """
+    data = gzip.compress(content.encode('utf-8'), compresslevel=README_CACHE_COMPRESS_LEVEL)
+    write_file_atomic(cache_path, data)
+
+def write_file_atomic(path: str, data: bytes):
+    """
+    原子写入文件：先写入同目录临时文件再替换，中断时不会留下不完整的文件
+    
+    Args:
+        path: 目标文件路径
+        data: 文件内容
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        remove_file(tmp_path)
+        raise
+
+def remove_file(path: str):
+    """
+    删除文件，文件不存在时忽略
+    
+    Args:
+        path: 文件路径
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def migrate_readme_cache(legacy_cache_path: str, cache_path: str):
+    """
+    将旧版未压缩的README缓存转换为压缩格式，并删除旧文件
+    
+    Args:
+        legacy_cache_path: 旧版缓存文件路径
+        cache_path: 压缩缓存文件路径
+    """
+    try:
+        with open(legacy_cache_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        write_readme_cache(cache_path, content)
+        # 保留原修改时间
+        mtime = os.path.getmtime(legacy_cache_path)
+        os.utime(cache_path, (mtime, mtime))
+        os.remove(legacy_cache_path)
+    except Exception as e:
+        print(f"⚠️ 转换缓存失败: {e}")
+
+def truncate_readme(content: str, repo: Dict) -> str:
+    """
+    显示处理进度并截断过长的README内容
     
     Args:
         content: README内容
-        api_key: DeepSeek API密钥
         repo: 仓库信息字典
         
     Returns:
-        AI生成的摘要字符串
+        截断后的README内容
     """
-    # 添加API请求间隔防止速率限制
-    time.sleep(1.2)
-    
-    # 显示处理进度
     content_size = len(content) / 1024  # KB
     print(f"  - 分析: {repo['name']} ({content_size:.1f}KB)")
     
-    # 截断过长的内容
-    if len(content) > 12000:
-        content = content[:12000] + "...[内容截断]"
+    return truncate_text(content, README_MAX_CHARS, README_TRUNCATED_SUFFIX)
+
+def format_repo_prompt(repo: Dict, content: str) -> str:
+    """
+    按模板生成单个项目的提示段落
     
-    try:
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+    Args:
+        repo: 仓库信息字典
+        content: 截断后的README内容
         
-        # 构建分析提示
-        prompt = f"""
-作为GitHub趋势分析专家，请分析以下项目：
-
-项目信息：
-- 名称：{repo['name']}
-- 主要语言：{repo['language'] or '未指定'}
-- 星标数：{repo['stargazers_count']}
-- 描述：{repo.get('description', '无')}
-
-README内容：
-{content}
-
-请从以下3个方面分析：
-1. 🎯 核心功能与解决的问题
-2. 💡 技术亮点与创新点
-3. 🔥 近期关注度高的原因
+    Returns:
+        项目提示段落
+    """
+    return PROMPT_REPO_TEMPLATE.format_map({
+        "name": repo['name'],
+        "language": repo['language'] or '未指定',
+        "stars": repo['stargazers_count'],
+        "description": repo.get('description') or '无',
+        "content": content
+    })
 
-要求：
-- 每点用"- "开头
-- 每点不超过40字
-- 使用专业但简洁的技术语言
-"""
+def request_ai_completion(prompt: str, api_key: str, max_tokens: int = 500) -> str:
+    """
+    向DeepSeek发送对话请求并返回回复文本
+    
+    Args:
+        prompt: 提示内容
+        api_key: DeepSeek API密钥
+        max_tokens: 最大生成token数
         
-        payload = {
-            "model": "deepseek-chat",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 500,
-            "temperature": 0.3  # 降低随机性
-        }
+    Returns:
+        AI回复文本
         
-        # 发送API请求
-        response = requests.post(
-            "https://api.deepseek.com/v1/chat/completions", 
-            headers=headers, 
-            json=payload,
-            timeout=30
-        )
-        response.raise_for_status()
-        
-        # 提取AI响应
-        result = response.json()
-        return result['choices'][0]['message']['content']
+    Raises:
+        requests.exceptions.RequestException: 请求失败
+        KeyError, ValueError: 响应解析失败
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "model": "deepseek-chat",
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+        "temperature": 0.3  # 降低随机性
+    }
+    
+    # 通过令牌桶限流；被限速（429）时按Retry-After暂停所有请求后重试
+    for attempt in range(AI_MAX_RETRIES + 1):
+        DEEPSEEK_RATE_LIMITER.acquire()
+        response = DEEPSEEK_SESSION.post(DEEPSEEK_API_URL, headers=headers, json=payload, timeout=30)
+        if response.status_code != 429 or attempt == AI_MAX_RETRIES:
+            break
+        retry_after = response.headers.get('Retry-After', '')
+        delay = float(retry_after) if retry_after.isdigit() else DEFAULT_RETRY_AFTER
+        print(f"⚠️ AI接口限速，{delay:.0f}秒后重试")
+        DEEPSEEK_RATE_LIMITER.pause(delay)
+    response.raise_for_status()
+    
+    # 提取AI响应
+    result = orjson.loads(response.content)
+    return result['choices'][0]['message']['content']
+
+def summarize_with_ai(content: str, api_key: str, repo: Dict) -> str:
+    """
+    使用DeepSeek API生成项目摘要
+    
+    Args:
+        content: README内容
+        api_key: DeepSeek API密钥
+        repo: 仓库信息字典
+        
+    Returns:
+        AI生成的摘要字符串
+    """
+    content = truncate_readme(content, repo)
+    prompt = f"{PROMPT_HEAD}\n待分析项目：\n\n{format_repo_prompt(repo, content)}"
+    
+    try:
+        return request_ai_completion(prompt, api_key)
     except requests.exceptions.RequestException as e:
         print(f"❌ API请求失败: {e}")
         return "AI分析请求失败"
@@ -445,6 +867,52 @@ README内容：
         print(f"❌ 解析API响应失败: {e}")
         return "解析AI响应失败"
 
+def summarize_batch_with_ai(batch: List[Tuple[Dict, str]], api_key: str) -> List[str]:
+    """
+    将多个项目合并为一次DeepSeek请求生成摘要
+    
+    模型按顺序输出各项目摘要并以单独一行的"---"分隔；内容超长、请求失败
+    或返回数量不匹配时退回逐个请求。
+    
+    Args:
+        batch: (仓库信息字典, README内容) 列表
+        api_key: DeepSeek API密钥
+        
+    Returns:
+        与batch顺序对应的AI摘要列表
+    """
+    if len(batch) == 1:
+        repo, content = batch[0]
+        return [summarize_with_ai(content, api_key, repo)]
+    
+    contents = [truncate_readme(content, repo) for repo, content in batch]
+    if sum(len(content) for content in contents) > AI_BATCH_MAX_CHARS:
+        return [summarize_with_ai(content, api_key, repo) for repo, content in batch]
+    
+    # 构建批量分析提示
+    sections = [f"=== REPO {i}: {repo['name']} ===\n{format_repo_prompt(repo, content)}"
+                for i, ((repo, _), content) in enumerate(zip(batch, contents), 1)]
+    prompt = f"{PROMPT_HEAD}{PROMPT_BATCH_NOTE}\n待分析项目（共{len(batch)}个）：\n\n" + "\n".join(sections)
+    
+    try:
+        result = request_ai_completion(prompt, api_key, max_tokens=500 * len(batch))
+    except requests.exceptions.HTTPError as e:
+        # 重试后仍被限速时不再拆分为逐个请求，避免加重服务端压力
+        if e.response is not None and e.response.status_code == 429:
+            print(f"❌ API请求失败: {e}")
+            return ["AI分析请求失败"] * len(batch)
+        print(f"⚠️ 批量分析失败，改为逐个分析: {e}")
+        return [summarize_with_ai(content, api_key, repo) for repo, content in batch]
+    except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+        print(f"⚠️ 批量分析失败，改为逐个分析: {e}")
+        return [summarize_with_ai(content, api_key, repo) for repo, content in batch]
+    
+    summaries = [part.strip() for part in BATCH_SEPARATOR_PATTERN.split(result) if part.strip()]
+    if len(summaries) != len(batch):
+        print(f"⚠️ 批量分析结果数量不匹配（{len(summaries)}/{len(batch)}），改为逐个分析")
+        return [summarize_with_ai(content, api_key, repo) for repo, content in batch]
+    return summaries
+
 def save_raw_data(repos: List[Dict], filename: str = "trending_repos.json"):
     """
     保存原始项目数据到JSON文件
@@ -454,12 +922,38 @@ def save_raw_data(repos: List[Dict], filename: str = "trending_repos.json"):
         filename: 输出文件名
     """
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(repos, f, ensure_ascii=False, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(repos, option=orjson.OPT_INDENT_2))
         print(f"✅ 原始数据已保存: {filename}")
     except Exception as e:
         print(f"❌ 保存原始数据失败: {e}")
 
+def compute_rank_changes(prev_dict: Dict[str, Tuple[int, int]],
+                         current_repos: List[Dict]) -> List[Tuple[Dict, int, int, int, Optional[float]]]:
+    """
+    单次遍历计算排名发生变化的项目及其星标变化率
+    
+    Args:
+        prev_dict: 历史项目索引（全名 -> (排名, 星标数)）
+        current_repos: 当前项目列表
+        
+    Returns:
+        (项目, 历史排名, 当前排名, 排名变化, 星标变化率%) 列表，按排名变化幅度从大到小排序；
+        排名变化为正表示上升，历史星标数为0时变化率为None
+    """
+    rank_changes = []
+    for curr_rank, repo in enumerate(current_repos, 1):
+        prev = prev_dict.get(repo['full_name'])
+        if prev is None or prev[0] == curr_rank:
+            continue
+        prev_rank, prev_stars = prev
+        # 星标数变化率（相对于历史星标数）
+        star_pct = (repo['stargazers_count'] - prev_stars) / prev_stars * 100 if prev_stars else None
+        rank_changes.append((repo, prev_rank, curr_rank, prev_rank - curr_rank, star_pct))
+    
+    rank_changes.sort(key=lambda x: abs(x[3]), reverse=True)
+    return rank_changes
+
 def compare_trends(previous_analysis: Dict, current_analysis: Dict, 
                   previous_repos: List[Dict], current_repos: List[Dict]):
     """
@@ -500,92 +994,75 @@ def compare_trends(previous_analysis: Dict, current_analysis: Dict,
             print(f"  - {lang}: {prev_count} → {curr_count} (变化: {change:+d}, {pct_str})")
 
     # 3. 项目排名变化
-    # 创建历史项目字典（包含排名和星标数）
-    prev_dict = {}
-    for i, repo in enumerate(previous_repos, 1):
-        prev_dict[repo['full_name']] = {
-            'rank': i,
-            'stars': repo['stargazers_count']
-        }
-    
-    curr_dict = {}
-    for i, repo in enumerate(current_repos, 1):
-        curr_dict[repo['full_name']] = {
-            'rank': i,
-            'stars': repo['stargazers_count']
-        }
+    # 历史项目索引：全名 -> (排名, 星标数)
+    prev_dict = {repo['full_name']: (i, repo['stargazers_count'])
+                 for i, repo in enumerate(previous_repos, 1)}
+    curr_names = {repo['full_name'] for repo in current_repos}
     
-    # 新上榜项目
-    new_projects = [repo for repo in current_repos if repo['full_name'] not in prev_dict]
+    # 新上榜项目（保持当前排名顺序）
+    new_names = curr_names - prev_dict.keys()
+    new_projects = [(i, repo) for i, repo in enumerate(current_repos, 1) if repo['full_name'] in new_names]
     if new_projects:
         print(f"\n🆕 新上榜项目 ({len(new_projects)}个):")
-        for repo in new_projects:
-            print(f"  #{curr_dict[repo['full_name']]['rank']} {repo['name']} ⭐{repo['stargazers_count']}")
-    
-    # 排名变化项目
-    rank_changes = []
-    for repo in current_repos:
-        name = repo['full_name']
-        if name in prev_dict:
-            prev_rank = prev_dict[name]['rank']
-            curr_rank = curr_dict[name]['rank']
-            if prev_rank != curr_rank:
-                change = prev_rank - curr_rank
-                # 添加历史星标数用于计算变化率
-                repo['prev_stars'] = prev_dict[name]['stars']
-                rank_changes.append((repo, prev_rank, curr_rank, change))
+        for rank, repo in new_projects:
+            print(f"  #{rank} {repo['name']} ⭐{repo['stargazers_count']}")
     
+    # 排名变化项目（已按变化幅度从大到小排序）
+    rank_changes = compute_rank_changes(prev_dict, current_repos)
     if rank_changes:
         print(f"\n📊 排名变化 ({len(rank_changes)}个):")
-        # 按变化幅度从大到小排序
-        for repo, prev_rank, curr_rank, change in sorted(rank_changes, key=lambda x: abs(x[3]), reverse=True):
+        for repo, prev_rank, curr_rank, change, star_pct in rank_changes:
             direction = "📈" if change > 0 else "📉"  # 正变化表示排名上升
-            # 计算星标数变化率（相对于历史星标数）
-            star_change = repo['stargazers_count'] - repo['prev_stars']
-            star_pct = (star_change / repo['prev_stars'] * 100) if repo['prev_stars'] != 0 else float('inf')
-            star_pct_str = f"{star_pct:+.2f}%" if repo['prev_stars'] != 0 else "N/A"
+            star_pct_str = f"{star_pct:+.2f}%" if star_pct is not None else "N/A"
             print(f"  {direction} {repo['name']}: #{prev_rank} → #{curr_rank} (排名变化: {change:+d}, 星标变化率: {star_pct_str})")
 
     print("=" * 50)
 
-def find_comparison_file(days_ago: int, data_dir: str = 'data') -> Optional[str]:
+# 历史数据文件名格式
+DATA_FILE_PATTERN = re.compile(r'^data_(\d{4})-(\d{2})-(\d{2})\.json$')
+
+def find_comparison_file(days_ago: int, data_dir: str = 'data', now: Optional[datetime] = None,
+                         exclude_path: Optional[str] = None) -> Optional[str]:
     """
     查找与指定天数最匹配的历史数据文件
     
     Args:
         days_ago: 要对比的天数（如7表示7天前）
         data_dir: 数据文件目录
+        now: 基准时间（默认当前时间）
+        exclude_path: 需要排除的文件路径（如本次运行正在写入的数据文件）
         
     Returns:
         最匹配的文件路径，找不到返回None
     """
-    target_date = datetime.now() - timedelta(days=days_ago)
-    pattern = os.path.join(data_dir, "data_*.json")
-    files = glob.glob(pattern)
+    target_date = ((now or datetime.now()) - timedelta(days=days_ago)).date()
     
-    if not files:
-        return None
-
     # 查找日期最接近的文件
     closest_file = None
     min_diff = float('inf')
     
-    for file_path in files:
+    try:
+        with os.scandir(data_dir) as it:
+            entries = list(it)
+    except FileNotFoundError:
+        return None
+    
+    for entry in entries:
+        # 从文件名提取日期（"data_YYYY-MM-DD.json"）
+        match = DATA_FILE_PATTERN.match(entry.name)
+        if not match or entry.path == exclude_path:
+            continue
         try:
-            # 从文件名提取日期
-            filename = os.path.basename(file_path)
-            date_str = filename[5:-5]  # 提取"data_YYYY-MM-DD.json"中的日期部分
-            file_date = datetime.strptime(date_str, '%Y-%m-%d')
-            
-            # 计算日期差
-            date_diff = abs((target_date - file_date).days)
-            
-            # 更新最接近的文件
-            if date_diff < min_diff:
-                min_diff = date_diff
-                closest_file = file_path
+            year, month, day = map(int, match.groups())
+            file_date = date(year, month, day)
         except ValueError:
-            continue  # 跳过格式不正确的文件名
+            continue  # 跳过日期无效的文件名
+        
+        # 计算日期差并更新最接近的文件
+        date_diff = abs((target_date - file_date).days)
+        if date_diff < min_diff:
+            min_diff = date_diff
+            closest_file = entry.path
     
     # 只返回日期差在2天内的文件
     return closest_file if min_diff <= 2 else None
@@ -622,8 +1099,12 @@ def main():
     
     print(f"\n🔄 获取最近{days}天的Top {limit}热门项目...")
     
+    # 本次运行统一使用同一基准时间
+    now = datetime.now()
+    today_str = now.strftime('%Y-%m-%d')
+    
     # 获取并分析数据
-    repos = get_trending_repos(days=days, limit=limit, token=token)
+    repos = get_trending_repos(days=days, limit=limit, token=token, now=now)
     if not repos:
         print("⚠️ 未获取到热门项目，程序终止")
         return
@@ -636,24 +1117,30 @@ def main():
     os.makedirs(data_dir, exist_ok=True)
     os.makedirs(reports_dir, exist_ok=True)
     
-    # 保存原始数据
-    today_str = datetime.now().strftime('%Y-%m-%d')
     raw_data_path = os.path.join(data_dir, f"data_{today_str}.json")
-    save_raw_data(repos, filename=raw_data_path)
+    report_filename = os.path.join(reports_dir, f"github_trending_{days}days_{today_str}.md")
     
-    # 生成并保存报告
+    # 打印控制台报告
     print_console_report(repos, analysis_result)
-    report_filename = os.path.join(reports_dir, f"github_trending_{days}days_{today_str}.md")
-    save_markdown_report(repos, analysis_result, days=days, filename=report_filename)
+    
+    # AI摘要和Markdown报告耗时最长，与原始数据保存、历史文件查找并发执行
+    # 在后台任务启动前保存浅拷贝，避免原始数据混入后台写入的ai_summary字段
+    raw_snapshot = [dict(repo) for repo in repos]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        md_future = executor.submit(save_markdown_report, repos, analysis_result, days, report_filename, now)
+        executor.submit(save_raw_data, raw_snapshot, raw_data_path)
+        # 今日数据正在写入，查找时排除
+        cmp_future = executor.submit(find_comparison_file, days, data_dir, now, raw_data_path)
+    md_future.result()
     
     # 趋势对比分析
     print("\n📊 正在分析趋势变化...")
     try:
-        comparison_file = find_comparison_file(days, data_dir)
+        comparison_file = cmp_future.result()
         if comparison_file:
             print(f"🔍 找到对比文件: {comparison_file}")
-            with open(comparison_file, 'r', encoding='utf-8') as f:
-                previous_data = json.load(f)
+            with open(comparison_file, 'rb') as f:
+                previous_data = orjson.loads(f.read())
             
             previous_analysis = analyze_data(previous_data)
             compare_trends(previous_analysis, analysis_result, previous_data, repos)